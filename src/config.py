@@ -1,4 +1,5 @@
-from typing import Dict, Union, List
+from types import MappingProxyType
+from typing import Dict, Union, List, FrozenSet, Mapping
 
 # Dictionary of settlements in Bilobozhnytska community and their coordinates
 SETTLEMENTS: Dict[str, Dict[str, float]] = {
@@ -14,6 +15,9 @@ SETTLEMENTS: Dict[str, Dict[str, float]] = {
     "Косів": {"lat": 48.9325, "lon": 25.7663},
 }
 
+# Settlement names for fast validation
+SETTLEMENT_NAMES: FrozenSet[str] = frozenset(SETTLEMENTS)
+
 # Cache settings
 WEATHER_CACHE_TIMEOUT: int = 1800  # 30 minutes in seconds
 FORECAST_CACHE_TIMEOUT: int = 3600  # 1 hour in seconds
@@ -21,10 +25,13 @@ NEWS_CACHE_TIMEOUT = 1800  # 30 minutes in seconds
 
 # API settings
 WEATHER_API_TIMEOUT: int = 10  # seconds
+WEATHER_API_RETRIES: int = 3  # retries on connection errors and 5xx responses
+WEATHER_API_BACKOFF: float = 0.3  # seconds, doubled after every retry
 
 # Notification settings
 DEFAULT_NOTIFICATION_TIMES: List[str] = ["08:00", "14:00", "20:00"]  # Default notification times
 MAX_NOTIFICATIONS_PER_USER: int = 5  # Maximum number of notifications per user
+NOTIFICATION_SEND_CONCURRENCY: int = 8  # Maximum notifications being sent at once
 
 # News sources
 NEWS_SOURCES = {
@@ -37,7 +44,7 @@ NEWS_SOURCES = {
 }
 
 # Emojis for different weather types
-WEATHER_EMOJIS: Dict[str, str] = {
+WEATHER_EMOJIS: Mapping[str, str] = MappingProxyType({
     "Clear": "☀️",
     "Clouds": "☁️",
     "Rain": "🌧️",
@@ -53,4 +60,4 @@ WEATHER_EMOJIS: Dict[str, str] = {
     "Ash": "🌫️",
     "Squall": "💨",
     "Tornado": "🌪️"
-} 
\ No newline at end of file
+})
\ No newline at end of file
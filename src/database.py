@@ -1,61 +1,184 @@
+import asyncio
 import sqlite3
-import json
 from datetime import datetime
 import logging
 import os
+import re
+import time
+import atexit
+import queue
+import threading
 from typing import Optional, List, Dict, Union
-from contextlib import contextmanager
-from config import SETTLEMENTS
+from contextlib import closing, contextmanager
+from functools import wraps
+from config import SETTLEMENT_NAMES
 
 logger = logging.getLogger(__name__)
 
+# Connection tuning applied right after every sqlite3.connect
+# (journal_mode=WAL is persistent and set once on the writer)
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Retry settings for "database is locked" errors
+LOCKED_RETRY_ATTEMPTS = 5
+LOCKED_RETRY_DELAY = 0.05  # seconds, doubled after every attempt
+
+# Notification time in HH:MM format
+_TIME_RE = re.compile(r'(?:[01]\d|2[0-3]):[0-5]\d')
+
+# Number of read-only connections kept in the reader pool
+READER_POOL_SIZE = 4
+
+# Size of the per-connection prepared statement cache
+CACHED_STATEMENTS = 64
+
+# Statements used on every request; kept identical so they stay prepared
+_Q_SAVE_SETTLEMENT = '''INSERT INTO user_settings (user_id, settlement) VALUES (?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET settlement = excluded.settlement'''
+_Q_GET_SETTLEMENT = 'SELECT settlement FROM user_settings WHERE user_id = ?'
+_Q_ENSURE_USER = 'INSERT OR IGNORE INTO user_settings (user_id) VALUES (?)'
+_Q_DELETE_NOTIFICATIONS = 'DELETE FROM user_notifications WHERE user_id = ?'
+_Q_INSERT_NOTIFICATION = 'INSERT OR IGNORE INTO user_notifications (user_id, time) VALUES (?, ?)'
+_Q_GET_NOTIFICATIONS = 'SELECT time FROM user_notifications WHERE user_id = ? ORDER BY time'
+_Q_UPDATE_LAST_NOTIFICATION = 'UPDATE user_settings SET last_notification = ? WHERE user_id = ?'
+_Q_NOTIFICATION_INDEX = '''SELECT un.time, us.user_id, us.settlement
+    FROM user_notifications un JOIN user_settings us USING (user_id)'''
+_Q_EXPORT_SETTINGS = 'SELECT user_id, settlement, last_notification FROM user_settings WHERE user_id = ?'
+_Q_IMPORT_SETTINGS = '''INSERT INTO user_settings
+    (user_id, settlement, last_notification)
+    VALUES (?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        settlement = excluded.settlement,
+        last_notification = excluded.last_notification'''
+
+def _checked_user_id(method):
+    """Check that user_id is an integer; the check is stripped under python -O"""
+    if not __debug__:
+        return method
+
+    @wraps(method)
+    def wrapper(self, user_id, *args, **kwargs):
+        if not isinstance(user_id, int):
+            raise ValueError("user_id must be an integer")
+        return method(self, user_id, *args, **kwargs)
+    return wrapper
+
 class Database:
     def __init__(self):
         self.db_path = os.path.join(os.path.dirname(__file__), 'weather_bot.db')
-        self.conn = None
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        atexit.register(self._close_all)
+
+        # Single serialized writer; readers are only opened once the file exists
+        self._write_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
         self.create_tables()
+
+        self._readers = queue.Queue()
+        for _ in range(READER_POOL_SIZE):
+            self._readers.put(self._connect(read_only=True))
+
+        # In-memory dispatch table: notification time -> {user_id: settlement}.
+        # Loaded once here and kept in sync by every write method.
+        self._index_lock = threading.Lock()
+        self._notif_index: Dict[str, Dict[int, Optional[str]]] = {}
+        for notification_time, user_id, settlement in self.execute_query(_Q_NOTIFICATION_INDEX, fetch_all=True):
+            self._notif_index.setdefault(notification_time, {})[user_id] = settlement
+
         self.backup_dir = "backups"
         
         # Create backup directory if it doesn't exist
         if not os.path.exists(self.backup_dir):
             os.makedirs(self.backup_dir)
 
+    def _connect(self, read_only: bool = False) -> sqlite3.Connection:
+        """Open and configure a new database connection"""
+        if read_only:
+            conn = sqlite3.connect(
+                f"file:{self.db_path}?mode=ro", uri=True, timeout=30, isolation_level=None,
+                check_same_thread=False, cached_statements=CACHED_STATEMENTS
+            )
+        else:
+            conn = sqlite3.connect(
+                self.db_path, timeout=30, isolation_level=None,
+                check_same_thread=False, cached_statements=CACHED_STATEMENTS
+            )
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        with self._connections_lock:
+            self._connections.append(conn)
+        return conn
+
+    def _close_all(self):
+        """Close every connection opened by this instance"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
     @contextmanager
-    def get_connection(self):
-        """Get database connection using context manager"""
-        conn = None
+    def get_connection(self, write: bool = False):
+        """Get database connection using context manager.
+
+        Writes go through the single writer connection inside a BEGIN IMMEDIATE
+        transaction; reads borrow a read-only connection from the pool.
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            yield conn
+            if write:
+                with self._write_lock:
+                    conn = self._writer
+                    self._execute_with_retry(conn, "BEGIN IMMEDIATE")
+                    try:
+                        yield conn
+                    except BaseException:
+                        if conn.in_transaction:
+                            conn.execute("ROLLBACK")
+                        raise
+                    conn.execute("COMMIT")
+            else:
+                conn = self._readers.get()
+                try:
+                    yield conn
+                finally:
+                    self._readers.put(conn)
         except sqlite3.Error as e:
             logger.error(f"Database connection error: {e}")
             raise
-        finally:
-            if conn:
-                conn.close()
 
-    def execute_query(self, query: str, params: tuple = None, fetch_all: bool = False) -> Optional[List[tuple]]:
-        """Execute SQL query with error handling"""
-        with self.get_connection() as conn:
+    def execute_query(self, query: str, params: tuple = None, fetch_all: bool = False,
+                      write: bool = False) -> Optional[List[tuple]]:
+        """Execute SQL query with error handling; pass write=True for statements that modify data"""
+        with self.get_connection(write=write) as conn:
             try:
-                cursor = conn.cursor()
-                if params:
-                    cursor.execute(query, params)
-                else:
-                    cursor.execute(query)
+                cursor = self._execute_with_retry(conn, query, params)
                 
                 if fetch_all:
-                    result = cursor.fetchall()
-                else:
-                    result = cursor.fetchone()
-                    
-                conn.commit()
-                return result
+                    return cursor.fetchall()
+                return cursor.fetchone()
             except sqlite3.Error as e:
                 logger.error(f"Query execution error: {e}")
-                conn.rollback()
                 raise
 
+    def _execute_with_retry(self, conn: sqlite3.Connection, query: str, params: tuple = None) -> sqlite3.Cursor:
+        """Execute statement, retrying with exponential backoff while the database is locked"""
+        delay = LOCKED_RETRY_DELAY
+        for attempt in range(LOCKED_RETRY_ATTEMPTS):
+            try:
+                return conn.execute(query, params or ())
+            except sqlite3.OperationalError as e:
+                if "database is locked" not in str(e) or attempt == LOCKED_RETRY_ATTEMPTS - 1:
+                    raise
+                logger.warning(f"Database is locked, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                delay *= 2
+
     def create_backup(self):
         """Create database backup"""
         try:
@@ -63,10 +186,8 @@ class Database:
                 self.backup_dir, 
                 f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
             )
-            with self.get_connection() as conn:
-                with open(backup_file, 'wb') as f:
-                    for line in conn.iterdump():
-                        f.write(f'{line}\n'.encode('utf-8'))
+            with self.get_connection() as conn, closing(sqlite3.connect(backup_file)) as dst:
+                conn.backup(dst)
             logger.info(f"Database backup created: {backup_file}")
         except Exception as e:
             logger.error(f"Backup creation error: {e}")
@@ -74,140 +195,259 @@ class Database:
     def create_tables(self):
         """Initialize database"""
         try:
-            self.execute_query('''CREATE TABLE IF NOT EXISTS user_settings
+            with self.get_connection(write=True) as conn:
+                # notifications is a legacy JSON column, see user_notifications
+                conn.execute('''CREATE TABLE IF NOT EXISTS user_settings
                                 (user_id INTEGER PRIMARY KEY,
                                  settlement TEXT,
                                  notifications TEXT,
-                                 last_notification TIMESTAMP)''')
+                                 last_notification INTEGER)''')
+                conn.execute('''CREATE TABLE IF NOT EXISTS user_notifications
+                                (user_id INTEGER,
+                                 time TEXT,
+                                 PRIMARY KEY (user_id, time))''')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_notif_time ON user_notifications (time)')
+                # Keeps the legacy-notifications migration check from scanning the table
+                conn.execute('''CREATE INDEX IF NOT EXISTS idx_us_notif ON user_settings (user_id)
+                                WHERE notifications IS NOT NULL''')
+                self._migrate_json_notifications(conn)
+                self._migrate_iso_timestamps(conn)
             logger.info("Database successfully initialized")
         except sqlite3.Error as e:
             logger.error(f"Database initialization error: {e}")
             raise
 
+    def _migrate_json_notifications(self, conn: sqlite3.Connection):
+        """Move notification times stored as JSON in user_settings into user_notifications"""
+        conn.execute(
+            '''INSERT OR IGNORE INTO user_notifications (user_id, time)
+               SELECT us.user_id, je.value
+               FROM user_settings us, json_each(us.notifications) je
+               WHERE us.notifications IS NOT NULL'''
+        )
+        migrated = conn.execute(
+            'UPDATE user_settings SET notifications = NULL WHERE notifications IS NOT NULL'
+        ).rowcount
+        if migrated:
+            logger.info(f"Migrated notification settings of {migrated} users")
+
+    def _index_set_user(self, user_id: int, settlement: Optional[str], times: List[str]):
+        """Replace notification times of a user in the in-memory dispatch table"""
+        with self._index_lock:
+            for time in list(self._notif_index):
+                users = self._notif_index[time]
+                users.pop(user_id, None)
+                if not users:
+                    del self._notif_index[time]
+            for time in times:
+                self._notif_index.setdefault(time, {})[user_id] = settlement
+
+    def _index_set_settlement(self, user_id: int, settlement: str):
+        """Update settlement of a user in the in-memory dispatch table"""
+        with self._index_lock:
+            for users in self._notif_index.values():
+                if user_id in users:
+                    users[user_id] = settlement
+
+    def _migrate_iso_timestamps(self, conn: sqlite3.Connection):
+        """Convert last_notification values stored as ISO strings into Unix timestamps"""
+        migrated = conn.execute(
+            """UPDATE user_settings
+               SET last_notification = CAST(strftime('%s', last_notification, 'utc') AS INTEGER)
+               WHERE typeof(last_notification) = 'text'"""
+        ).rowcount
+        if migrated:
+            logger.info(f"Migrated last notification time of {migrated} users")
+
     def validate_settlement(self, settlement: str) -> bool:
         """Validate settlement name"""
-        return settlement in SETTLEMENTS
+        return settlement in SETTLEMENT_NAMES
 
+    @_checked_user_id
     def save_user_settlement(self, user_id: int, settlement: str):
         """Save user's selected settlement"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
         if not self.validate_settlement(settlement):
             raise ValueError("Invalid settlement name")
             
-        self.execute_query(
-            'INSERT OR REPLACE INTO user_settings (user_id, settlement) VALUES (?, ?)',
-            (user_id, settlement)
-        )
+        with self.get_connection(write=True) as conn:
+            conn.execute(_Q_SAVE_SETTLEMENT, (user_id, settlement))
+            self._index_set_settlement(user_id, settlement)
 
+    @_checked_user_id
     def get_user_settlement(self, user_id: int) -> Optional[str]:
         """Get user's selected settlement"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
-            
         result = self.execute_query(
-            'SELECT settlement FROM user_settings WHERE user_id = ?',
+            _Q_GET_SETTLEMENT,
             (user_id,)
         )
         return result[0] if result else None
 
     def validate_notification_times(self, times: List[str]) -> bool:
         """Validate notification times"""
-        try:
-            for time in times:
-                hours, minutes = map(int, time.split(':'))
-                if not (0 <= hours <= 23 and 0 <= minutes <= 59):
-                    return False
-            return True
-        except ValueError:
-            return False
+        return all(_TIME_RE.fullmatch(time) for time in times)
 
+    @_checked_user_id
     def save_user_notifications(self, user_id: int, notification_times: List[str]):
         """Save user's notification settings"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
         if not self.validate_notification_times(notification_times):
             raise ValueError("Invalid notification time format")
             
-        self.execute_query(
-            'INSERT OR REPLACE INTO user_settings (user_id, notifications) VALUES (?, ?)',
-            (user_id, json.dumps(notification_times))
-        )
+        with self.get_connection(write=True) as conn:
+            conn.execute(_Q_ENSURE_USER, (user_id,))
+            conn.execute(_Q_DELETE_NOTIFICATIONS, (user_id,))
+            conn.executemany(
+                _Q_INSERT_NOTIFICATION,
+                [(user_id, time) for time in notification_times]
+            )
+            settlement = conn.execute(_Q_GET_SETTLEMENT, (user_id,)).fetchone()[0]
+            self._index_set_user(user_id, settlement, notification_times)
 
+    @_checked_user_id
     def get_user_notifications(self, user_id: int) -> List[str]:
         """Get user's notification settings"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
-            
-        result = self.execute_query(
-            'SELECT notifications FROM user_settings WHERE user_id = ?',
-            (user_id,)
+        rows = self.execute_query(
+            _Q_GET_NOTIFICATIONS,
+            (user_id,),
+            fetch_all=True
         )
-        return json.loads(result[0]) if result and result[0] else []
+        return [row[0] for row in rows]
 
+    @_checked_user_id
     def update_last_notification(self, user_id: int):
         """Update last notification time"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
-            
         self.execute_query(
-            'UPDATE user_settings SET last_notification = ? WHERE user_id = ?',
-            (datetime.now().isoformat(), user_id)
+            _Q_UPDATE_LAST_NOTIFICATION,
+            (int(time.time()), user_id),
+            write=True
         )
 
+    def update_last_notifications_bulk(self, user_ids: List[int]):
+        """Update last notification time of several users in a single transaction"""
+        if __debug__ and not all(isinstance(user_id, int) for user_id in user_ids):
+            raise ValueError("user_id must be an integer")
+        if not user_ids:
+            return
+            
+        now = int(time.time())
+        with self.get_connection(write=True) as conn:
+            conn.executemany(_Q_UPDATE_LAST_NOTIFICATION, [(now, user_id) for user_id in user_ids])
+
     def get_users_for_notification(self, current_time: str) -> List[Dict[str, Union[int, str]]]:
         """Get list of users for notification"""
         if not self.validate_notification_times([current_time]):
             raise ValueError("Invalid time format")
             
-        rows = self.execute_query(
-            'SELECT user_id, settlement, notifications FROM user_settings WHERE notifications IS NOT NULL',
-            fetch_all=True
-        )
-        
-        users = []
-        for row in rows:
-            user_id, settlement, notifications = row
-            notification_times = json.loads(notifications) if notifications else []
-            if current_time in notification_times:
-                users.append({"user_id": user_id, "settlement": settlement})
-        return users
+        with self._index_lock:
+            users = list(self._notif_index.get(current_time, {}).items())
+        return [{"user_id": user_id, "settlement": settlement} for user_id, settlement in users]
 
+    @_checked_user_id
     def export_user_settings(self, user_id: int) -> Dict:
         """Export user settings"""
-        if not isinstance(user_id, int):
-            raise ValueError("user_id must be an integer")
-            
         result = self.execute_query(
-            'SELECT * FROM user_settings WHERE user_id = ?',
+            _Q_EXPORT_SETTINGS,
             (user_id,)
         )
         if result:
             return {
                 "user_id": result[0],
                 "settlement": result[1],
-                "notifications": json.loads(result[2]) if result[2] else [],
-                "last_notification": result[3]
+                "notifications": self.get_user_notifications(user_id),
+                "last_notification": (
+                    datetime.fromtimestamp(result[2]).isoformat() if result[2] is not None else None
+                )
             }
         return None
 
+    @staticmethod
+    def _to_timestamp(value: Union[str, int, None]) -> Optional[int]:
+        """Convert an exported ISO time string into a Unix timestamp"""
+        if value is None or isinstance(value, int):
+            return value
+        return int(datetime.fromisoformat(value).timestamp())
+
     def import_user_settings(self, settings: Dict):
         """Import user settings"""
-        if not isinstance(settings.get("user_id"), int):
-            raise ValueError("user_id must be an integer")
-        if not self.validate_settlement(settings.get("settlement", "")):
-            raise ValueError("Invalid settlement name")
-        if not self.validate_notification_times(settings.get("notifications", [])):
-            raise ValueError("Invalid notification time format")
-            
-        self.execute_query(
-            '''INSERT OR REPLACE INTO user_settings 
-               (user_id, settlement, notifications, last_notification)
-               VALUES (?, ?, ?, ?)''',
-            (
-                settings["user_id"],
-                settings["settlement"],
-                json.dumps(settings["notifications"]),
-                settings.get("last_notification")
+        self.import_many([settings])
+
+    def import_many(self, settings_list: List[Dict]):
+        """Import settings of several users in a single transaction"""
+        for settings in settings_list:
+            if not isinstance(settings.get("user_id"), int):
+                raise ValueError("user_id must be an integer")
+            if not self.validate_settlement(settings.get("settlement", "")):
+                raise ValueError("Invalid settlement name")
+            if not self.validate_notification_times(settings.get("notifications", [])):
+                raise ValueError("Invalid notification time format")
+
+        with self.get_connection(write=True) as conn:
+            conn.executemany(
+                _Q_IMPORT_SETTINGS,
+                [
+                    (
+                        settings["user_id"],
+                        settings["settlement"],
+                        self._to_timestamp(settings.get("last_notification"))
+                    )
+                    for settings in settings_list
+                ]
+            )
+            conn.executemany(
+                _Q_DELETE_NOTIFICATIONS,
+                [(settings["user_id"],) for settings in settings_list]
             )
-        ) 
\ No newline at end of file
+            conn.executemany(
+                _Q_INSERT_NOTIFICATION,
+                [
+                    (settings["user_id"], time)
+                    for settings in settings_list
+                    for time in settings["notifications"]
+                ]
+            )
+            for settings in settings_list:
+                self._index_set_user(settings["user_id"], settings["settlement"], settings["notifications"])
+
+
+class AsyncDatabase:
+    """Asyncio facade over Database.
+
+    Blocking sqlite3 calls run in worker threads via asyncio.to_thread, so they
+    do not stall the event loop; writes stay serialized by the Database writer lock.
+    """
+
+    def __init__(self, database: Optional[Database] = None):
+        self._db = database or Database()
+
+    async def create_backup(self):
+        await asyncio.to_thread(self._db.create_backup)
+
+    async def save_user_settlement(self, user_id: int, settlement: str):
+        await asyncio.to_thread(self._db.save_user_settlement, user_id, settlement)
+
+    async def get_user_settlement(self, user_id: int) -> Optional[str]:
+        return await asyncio.to_thread(self._db.get_user_settlement, user_id)
+
+    async def save_user_notifications(self, user_id: int, notification_times: List[str]):
+        await asyncio.to_thread(self._db.save_user_notifications, user_id, notification_times)
+
+    async def get_user_notifications(self, user_id: int) -> List[str]:
+        return await asyncio.to_thread(self._db.get_user_notifications, user_id)
+
+    async def update_last_notification(self, user_id: int):
+        await asyncio.to_thread(self._db.update_last_notification, user_id)
+
+    async def update_last_notifications_bulk(self, user_ids: List[int]):
+        await asyncio.to_thread(self._db.update_last_notifications_bulk, user_ids)
+
+    async def get_users_for_notification(self, current_time: str) -> List[Dict[str, Union[int, str]]]:
+        # Served from the in-memory dispatch table, no need for a worker thread
+        return self._db.get_users_for_notification(current_time)
+
+    async def export_user_settings(self, user_id: int) -> Dict:
+        return await asyncio.to_thread(self._db.export_user_settings, user_id)
+
+    async def import_user_settings(self, settings: Dict):
+        await asyncio.to_thread(self._db.import_user_settings, settings)
+
+    async def import_many(self, settings_list: List[Dict]):
+        await asyncio.to_thread(self._db.import_many, settings_list)
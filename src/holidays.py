@@ -1,8 +1,10 @@
-from datetime import datetime, timedelta
-import calendar
+from datetime import date, datetime
+from functools import lru_cache
+from types import MappingProxyType
 
-def calculate_easter(year):
-    """Calculate the date of Orthodox Easter using Meeus's algorithm."""
+@lru_cache(maxsize=16)
+def _easter_month_day(year):
+    """Calculate (month, day) of Orthodox Easter using Meeus's algorithm."""
     a = year % 19
     b = year % 4
     c = year % 7
@@ -18,34 +20,47 @@ def calculate_easter(year):
         month = 4
     
     # Convert from Julian to Gregorian calendar
-    julian_date = datetime(year, month, day)
-    gregorian_date = julian_date + timedelta(days=13)
+    day += 13
+    if month == 3 and day > 31:
+        day -= 31
+        month = 4
+    elif month == 4 and day > 30:
+        day -= 30
+        month = 5
     
-    return gregorian_date.strftime("%m-%d")
+    return month, day
 
+@lru_cache(maxsize=16)
+def calculate_easter(year):
+    """Calculate the date of Orthodox Easter."""
+    month, day = _easter_month_day(year)
+    return f"{month:02d}-{day:02d}"
+
+@lru_cache(maxsize=16)
 def calculate_vyshyvanka_day(year):
     """Calculate Vyshyvanka Day (third Thursday in May)."""
-    c = calendar.monthcalendar(year, 5)
-    thursdays = [week[calendar.THURSDAY] for week in c if week[calendar.THURSDAY] != 0]
-    third_thursday = thursdays[2]
+    first_weekday = date(year, 5, 1).weekday()
+    third_thursday = 15 + (3 - first_weekday) % 7
     return f"05-{third_thursday:02d}"
 
+@lru_cache(maxsize=16)
 def calculate_trinity_day(year):
     """Calculate Trinity Day (50 days after Easter)."""
-    easter_date = datetime.strptime(f"{year}-{calculate_easter(year)}", "%Y-%m-%d")
-    trinity_date = easter_date + timedelta(days=49)
-    return trinity_date.strftime("%m-%d")
+    month, day = _easter_month_day(year)
+    trinity_date = date.fromordinal(date(year, month, day).toordinal() + 49)
+    return f"{trinity_date.month:02d}-{trinity_date.day:02d}"
 
+@lru_cache(maxsize=16)
 def get_dynamic_holidays(year):
     """Get holidays with dynamic dates for a specific year."""
-    return {
+    return MappingProxyType({
         calculate_easter(year): "🐣 Великдень",
         calculate_vyshyvanka_day(year): "🌺 День вишиванки",
         calculate_trinity_day(year): "🌿 Трійця"
-    }
+    })
 
 # Static holidays and significant dates
-STATIC_HOLIDAYS = {
+STATIC_HOLIDAYS = MappingProxyType({
     # Січень
     "01-01": "🎄 Новий рік",
     "01-06": "🌟 Святвечір",
@@ -99,13 +114,15 @@ STATIC_HOLIDAYS = {
     "12-06": "🎖️ День Збройних Сил України",
     "12-19": "🎅 День Святого Миколая",
     "12-25": "🎄 Різдво Христове (за григоріанським календарем)"
-}
+})
 
 def get_all_holidays(year=None):
     """Get all holidays including dynamic dates."""
     if year is None:
         year = datetime.now().year
-        
-    all_holidays = STATIC_HOLIDAYS.copy()
-    all_holidays.update(get_dynamic_holidays(year))
-    return all_holidays 
\ No newline at end of file
+    return _get_holidays_for_year(year)
+
+@lru_cache(maxsize=16)
+def _get_holidays_for_year(year):
+    """Build the read-only holidays mapping of a year once."""
+    return MappingProxyType({**STATIC_HOLIDAYS, **get_dynamic_holidays(year)}) 
\ No newline at end of file
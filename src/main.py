@@ -1,34 +1,49 @@
-import telebot
+import asyncio
+import aiohttp
+import orjson
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from cachetools import TTLCache
 from telebot import types
-import requests
+from telebot.async_telebot import AsyncTeleBot
 import datetime
-import json
 import os
 import logging
-import threading
-import time
+import logging.handlers
+import queue
+import atexit
 from dotenv import load_dotenv
 from config import (
-    SETTLEMENTS, WEATHER_CACHE_TIMEOUT, WEATHER_API_TIMEOUT, 
+    SETTLEMENTS, WEATHER_CACHE_TIMEOUT, WEATHER_API_TIMEOUT, WEATHER_API_RETRIES, WEATHER_API_BACKOFF,
     WEATHER_EMOJIS, FORECAST_CACHE_TIMEOUT, DEFAULT_NOTIFICATION_TIMES,
-    MAX_NOTIFICATIONS_PER_USER, NEWS_SOURCES
+    MAX_NOTIFICATIONS_PER_USER, NOTIFICATION_SEND_CONCURRENCY, NEWS_SOURCES
 )
 from holidays import get_all_holidays
-from database import Database
+from database import AsyncDatabase
 from news import NewsLinks
 
 # Logging settings
 log_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'logs')
 os.makedirs(log_dir, exist_ok=True)
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(log_dir, 'bot.log')),
-        logging.StreamHandler()
-    ]
-)
+# File and console output run on a background listener thread,
+# so logging calls only enqueue records and never block on disk I/O
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [
+    logging.FileHandler(os.path.join(log_dir, 'bot.log')),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+
+# Records are formatted by the listener's handlers, not by the queue handler
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
 logger = logging.getLogger(__name__)
 
 # Loading environment variables
@@ -48,33 +63,51 @@ if not WEATHER_API_KEY:
     raise ValueError("WEATHER_API_KEY not found in environment variables")
 
 # Creating bot, database and news parser instances
-bot = telebot.TeleBot(BOT_TOKEN)
-db = Database()
+bot = AsyncTeleBot(BOT_TOKEN)
+db = AsyncDatabase()
 news_parser = NewsLinks()
 
-# Data caches
-weather_cache = {}
-forecast_cache = {}
+# Shared HTTP session for the weather API, created on the running event loop in main()
+http_session = None
+
+# Data caches, bounded in size and expiring after the configured timeouts
+weather_cache = TTLCache(maxsize=len(SETTLEMENTS) * 4, ttl=WEATHER_CACHE_TIMEOUT)
+forecast_cache = TTLCache(maxsize=len(SETTLEMENTS) * 4, ttl=FORECAST_CACHE_TIMEOUT)
+
+# User notification times by chat id, kept in sync with the database on every save
+user_notifications_cache = TTLCache(maxsize=10000, ttl=600)
 
-# List of holidays
-holidays = get_all_holidays()
+# HTTP statuses of the weather API worth retrying
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Request weather API, retrying transient failures with exponential backoff
+async def fetch_weather_api(url):
+    delay = WEATHER_API_BACKOFF
+    for attempt in range(WEATHER_API_RETRIES + 1):
+        last_attempt = attempt == WEATHER_API_RETRIES
+        try:
+            async with http_session.get(url) as response:
+                if response.status not in RETRY_STATUSES or last_attempt:
+                    response.raise_for_status()
+                    return orjson.loads(await response.read())
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if last_attempt:
+                raise
+        await asyncio.sleep(delay)
+        delay *= 2
 
 # Function to get weather
-def get_weather(lat, lon):
-    cache_key = f"{lat}_{lon}"
-    current_time = time.time()
+async def get_weather(lat, lon):
+    cache_key = (lat, lon)
     
     # Cache check
-    if cache_key in weather_cache:
-        cached_data = weather_cache[cache_key]
-        if current_time - cached_data['timestamp'] < WEATHER_CACHE_TIMEOUT:
-            return cached_data['data']
+    cached_data = weather_cache.get(cache_key)
+    if cached_data is not None:
+        return cached_data
     
     try:
         url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}&units=metric&lang=uk"
-        response = requests.get(url, timeout=WEATHER_API_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_weather_api(url)
         
         weather_description = data["weather"][0]["description"]
         temp = data["main"]["temp"]
@@ -93,13 +126,10 @@ def get_weather(lat, lon):
         )
         
         # Storing in cache
-        weather_cache[cache_key] = {
-            'data': weather_info,
-            'timestamp': current_time
-        }
+        weather_cache[cache_key] = weather_info
         
         return weather_info
-    except requests.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"Weather API request error: {e}")
         return "❌ Failed to get weather data. Please try again later."
     except KeyError as e:
@@ -113,68 +143,83 @@ def get_weather(lat, lon):
 def get_weather_emoji(weather_main):
     return WEATHER_EMOJIS.get(weather_main, "🌈")
 
+# Today's holiday message, computed once per day: (date, message)
+_holiday_day_cache = None
+
 # Check holidays for current day
 def get_today_holidays():
-    today = datetime.datetime.now()
+    global _holiday_day_cache
+    today = datetime.date.today()
+    if _holiday_day_cache is not None and _holiday_day_cache[0] == today:
+        return _holiday_day_cache[1]
+    
     holidays = get_all_holidays(today.year)
     today_key = today.strftime("%m-%d")
     
     if today_key in holidays:
-        return f"📅 *Сьогодні:* {holidays[today_key]}"
-    return "📅 *Сьогодні немає державних або релігійних свят.*"
+        message = f"📅 *Сьогодні:* {holidays[today_key]}"
+    else:
+        message = "📅 *Сьогодні немає державних або релігійних свят.*"
+    _holiday_day_cache = (today, message)
+    return message
 
-def get_weather_forecast(lat, lon):
+async def get_weather_forecast(lat, lon):
     """Get 5-day weather forecast"""
-    cache_key = f"{lat}_{lon}"
-    current_time = time.time()
+    cache_key = (lat, lon)
     
-    if cache_key in forecast_cache:
-        cached_data = forecast_cache[cache_key]
-        if current_time - cached_data['timestamp'] < FORECAST_CACHE_TIMEOUT:
-            return cached_data['data']
+    cached_data = forecast_cache.get(cache_key)
+    if cached_data is not None:
+        return cached_data
     
     try:
         url = f"https://api.openweathermap.org/data/2.5/forecast?lat={lat}&lon={lon}&appid={WEATHER_API_KEY}&units=metric&lang=uk"
-        response = requests.get(url, timeout=WEATHER_API_TIMEOUT)
-        response.raise_for_status()
-        data = response.json()
+        data = await fetch_weather_api(url)
         
         forecast_info = []
-        current_date = None
+        current_day = None
+        # Days are counted in the settlement's local time (UTC offset in seconds)
+        utc_offset = data.get('city', {}).get('timezone', 0)
         
         for item in data['list']:
-            date = datetime.datetime.fromtimestamp(item['dt'])
-            if current_date != date.date():
-                current_date = date.date()
-                
-                weather = item['weather'][0]
-                temp = item['main']['temp']
-                weather_emoji = get_weather_emoji(weather['main'])
-                
-                forecast_info.append(
-                    f"\n📅 *{date.strftime('%d.%m.%Y')}*:\n"
-                    f"{weather_emoji} {weather['description'].capitalize()}\n"
-                    f"🌡️ Температура: {temp:.1f}°C"
-                )
+            day = (item['dt'] + utc_offset) // 86400
+            if day == current_day:
+                continue
+            current_day = day
+            
+            date = datetime.datetime.fromtimestamp(day * 86400, datetime.timezone.utc)
+            weather = item['weather'][0]
+            temp = item['main']['temp']
+            weather_emoji = get_weather_emoji(weather['main'])
+            
+            forecast_info.append(
+                f"\n📅 *{date:%d.%m.%Y}*:\n"
+                f"{weather_emoji} {weather['description'].capitalize()}\n"
+                f"🌡️ Температура: {temp:.1f}°C"
+            )
         
         result = "🔮 *Прогноз погоди на 5 днів:*\n" + "\n".join(forecast_info)
         
-        forecast_cache[cache_key] = {
-            'data': result,
-            'timestamp': current_time
-        }
+        forecast_cache[cache_key] = result
         
         return result
     except Exception as e:
         logger.error(f"Error getting weather forecast: {e}")
         return "❌ Failed to get weather forecast. Please try again later."
 
-def show_notification_settings(message):
+async def get_user_notifications(chat_id):
+    """Get user's notification times, from cache when possible"""
+    current_times = user_notifications_cache.get(chat_id)
+    if current_times is None:
+        current_times = await db.get_user_notifications(chat_id)
+        user_notifications_cache[chat_id] = current_times
+    return current_times
+
+async def show_notification_settings(message):
     """Show notification settings"""
     markup = types.InlineKeyboardMarkup(row_width=1)
     
     # Get current settings
-    current_times = db.get_user_notifications(message.chat.id)
+    current_times = await get_user_notifications(message.chat.id)
     
     # Add buttons for default times
     for time in DEFAULT_NOTIFICATION_TIMES:
@@ -187,7 +232,7 @@ def show_notification_settings(message):
         "🔄 Зберегти налаштування", callback_data="save_notifications"
     ))
     
-    bot.send_message(
+    await bot.send_message(
         message.chat.id,
         "⚙️ *Налаштування сповіщень про погоду*\n\n"
         "Оберіть час, коли ви хочете отримувати сповіщення про погоду:\n"
@@ -197,144 +242,189 @@ def show_notification_settings(message):
         parse_mode="Markdown"
     )
 
-def show_news_sources(message):
+async def show_news_sources(message):
     """Show available news sources"""
     news = news_parser.get_news_sources()
-    bot.send_message(
+    await bot.send_message(
         message.chat.id,
         news,
         parse_mode="Markdown",
         disable_web_page_preview=True
     )
 
+# Main menu keyboard, built once
+START_MARKUP = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
+START_MARKUP.add(
+    types.KeyboardButton('🌤️ Погода'),
+    types.KeyboardButton('🔮 Прогноз'),
+    types.KeyboardButton('📰 Новини'),
+    types.KeyboardButton('📅 Свята сьогодні'),
+    types.KeyboardButton('⚙️ Налаштування')
+)
+
+WELCOME_MESSAGE = (
+    "Вітаю! Я бот Білобожницької громади. 👋\n\n"
+    "Я можу показати вам:\n"
+    "- Поточну погоду 🌤️\n"
+    "- Прогноз погоди на 5 днів 🔮\n"
+    "- Останні новини 📰\n"
+    "- Свята та визначні дати 📅\n"
+    "- Налаштувати сповіщення про погоду ⚙️"
+)
+
 # Updated /start command handler
 @bot.message_handler(commands=['start'])
-def start(message):
-    markup = types.ReplyKeyboardMarkup(resize_keyboard=True, row_width=2)
-    weather_button = types.KeyboardButton('🌤️ Погода')
-    forecast_button = types.KeyboardButton('🔮 Прогноз')
-    news_button = types.KeyboardButton('📰 Новини')
-    holiday_button = types.KeyboardButton('📅 Свята сьогодні')
-    settings_button = types.KeyboardButton('⚙️ Налаштування')
-    markup.add(weather_button, forecast_button, news_button, holiday_button, settings_button)
-    
-    welcome_message = (
-        "Вітаю! Я бот Білобожницької громади. 👋\n\n"
-        "Я можу показати вам:\n"
-        "- Поточну погоду 🌤️\n"
-        "- Прогноз погоди на 5 днів 🔮\n"
-        "- Останні новини 📰\n"
-        "- Свята та визначні дати 📅\n"
-        "- Налаштувати сповіщення про погоду ⚙️"
-    )
-    
-    bot.send_message(message.chat.id, welcome_message, reply_markup=markup)
+async def start(message):
+    await bot.send_message(message.chat.id, WELCOME_MESSAGE, reply_markup=START_MARKUP)
 
 # Weather command handler
 @bot.message_handler(commands=['weather'])
-def weather_command(message):
-    show_settlement_selection(message, "weather")
+async def weather_command(message):
+    await show_settlement_selection(message, "weather")
 
 # Forecast command handler
 @bot.message_handler(commands=['forecast'])
-def forecast_command(message):
-    show_settlement_selection(message, "forecast")
+async def forecast_command(message):
+    await show_settlement_selection(message, "forecast")
 
 # News command handler
 @bot.message_handler(commands=['news'])
-def news_command(message):
-    show_news_sources(message)
+async def news_command(message):
+    await show_news_sources(message)
+
+# Send today's holidays
+async def send_today_holidays(message):
+    holiday_info = get_today_holidays()
+    await bot.send_message(message.chat.id, holiday_info, parse_mode="Markdown")
 
 # Holiday command handler
 @bot.message_handler(commands=['holiday'])
-def holiday_command(message):
-    holiday_info = get_today_holidays()
-    bot.send_message(message.chat.id, holiday_info, parse_mode="Markdown")
+async def holiday_command(message):
+    await send_today_holidays(message)
 
-# Show settlement selection menu
-def show_settlement_selection(message, action_type="weather"):
+# Settlements by position, encoded in callback data as "<action>_<index>"
+SETTLEMENT_BY_IDX = list(SETTLEMENTS)
+
+# Resolve settlement from callback data argument, None if malformed
+def _settlement_from_callback(arg):
+    try:
+        idx = int(arg)
+    except ValueError:
+        # Keyboards sent before the switch to indexes carry the settlement name
+        return arg if arg in SETTLEMENTS else None
+    if 0 <= idx < len(SETTLEMENT_BY_IDX):
+        return SETTLEMENT_BY_IDX[idx]
+    return None
+
+# Build settlement selection keyboard for an action
+def _build_settlement_markup(action_type):
     markup = types.InlineKeyboardMarkup(row_width=2)
-    buttons = []
-    
-    for settlement in SETTLEMENTS:
-        callback_data = f"{action_type}_{settlement}"
-        buttons.append(types.InlineKeyboardButton(settlement, callback_data=callback_data))
-    
-    markup.add(*buttons)
-    
-    title = "Оберіть населений пункт для отримання"
-    if action_type == "weather":
-        title += " погоди"
-    else:
-        title += " прогнозу погоди"
-    
-    bot.send_message(message.chat.id, title, reply_markup=markup)
+    markup.add(*(
+        types.InlineKeyboardButton(settlement, callback_data=f"{action_type}_{idx}")
+        for idx, settlement in enumerate(SETTLEMENT_BY_IDX)
+    ))
+    return markup
 
-# Callback handler
-@bot.callback_query_handler(func=lambda call: True)
-def callback_handler(call):
-    if call.data.startswith("weather_"):
-        settlement = call.data.split("_")[1]
-        if settlement in SETTLEMENTS:
-            lat = SETTLEMENTS[settlement]["lat"]
-            lon = SETTLEMENTS[settlement]["lon"]
-            weather_info = get_weather(lat, lon)
-            message_text = f"*Погода у {settlement}*\n\n{weather_info}"
-            bot.send_message(call.message.chat.id, message_text, parse_mode="Markdown")
-            
-            # Save selected settlement
-            db.save_user_settlement(call.message.chat.id, settlement)
-    
-    elif call.data.startswith("forecast_"):
-        settlement = call.data.split("_")[1]
-        if settlement in SETTLEMENTS:
-            lat = SETTLEMENTS[settlement]["lat"]
-            lon = SETTLEMENTS[settlement]["lon"]
-            forecast_info = get_weather_forecast(lat, lon)
-            message_text = f"*Прогноз погоди для {settlement}*\n\n{forecast_info}"
-            bot.send_message(call.message.chat.id, message_text, parse_mode="Markdown")
-    
-    elif call.data.startswith("news_"):
-        source = call.data.split("_")[1]
-        news = news_parser.get_source_link(source)
-        bot.send_message(call.message.chat.id, news, parse_mode="Markdown", disable_web_page_preview=False)
-    
-    elif call.data.startswith("toggle_notification_"):
-        time = call.data.split("_")[2]
-        current_times = db.get_user_notifications(call.message.chat.id)
-        
-        if time in current_times:
-            current_times.remove(time)
-        elif len(current_times) < MAX_NOTIFICATIONS_PER_USER:
-            current_times.append(time)
+# Settlement selection keyboards and titles, built once
+_SETTLEMENT_MARKUPS = {
+    "weather": _build_settlement_markup("weather"),
+    "forecast": _build_settlement_markup("forecast")
+}
+_SETTLEMENT_TITLES = {
+    "weather": "Оберіть населений пункт для отримання погоди",
+    "forecast": "Оберіть населений пункт для отримання прогнозу погоди"
+}
+
+# Show settlement selection menu
+async def show_settlement_selection(message, action_type="weather"):
+    await bot.send_message(
+        message.chat.id,
+        _SETTLEMENT_TITLES[action_type],
+        reply_markup=_SETTLEMENT_MARKUPS[action_type]
+    )
+
+# Callback handlers by callback data prefix
+async def _handle_weather_callback(call, arg):
+    settlement = _settlement_from_callback(arg)
+    if settlement is not None:
+        lat = SETTLEMENTS[settlement]["lat"]
+        lon = SETTLEMENTS[settlement]["lon"]
+        weather_info = await get_weather(lat, lon)
+        message_text = f"*Погода у {settlement}*\n\n{weather_info}"
+        await bot.send_message(call.message.chat.id, message_text, parse_mode="Markdown")
         
-        db.save_user_notifications(call.message.chat.id, current_times)
-        show_notification_settings(call.message)
+        # Save selected settlement
+        await db.save_user_settlement(call.message.chat.id, settlement)
+
+async def _handle_forecast_callback(call, arg):
+    settlement = _settlement_from_callback(arg)
+    if settlement is not None:
+        lat = SETTLEMENTS[settlement]["lat"]
+        lon = SETTLEMENTS[settlement]["lon"]
+        forecast_info = await get_weather_forecast(lat, lon)
+        message_text = f"*Прогноз погоди для {settlement}*\n\n{forecast_info}"
+        await bot.send_message(call.message.chat.id, message_text, parse_mode="Markdown")
+
+async def _handle_news_callback(call, source):
+    news = news_parser.get_source_link(source)
+    await bot.send_message(call.message.chat.id, news, parse_mode="Markdown", disable_web_page_preview=False)
+
+async def _handle_toggle_callback(call, arg):
+    # arg is "notification_HH:MM"
+    time = arg.rpartition("_")[2]
+    current_times = list(await get_user_notifications(call.message.chat.id))
+    
+    if time in current_times:
+        current_times.remove(time)
+    elif len(current_times) < MAX_NOTIFICATIONS_PER_USER:
+        current_times.append(time)
     
-    elif call.data == "save_notifications":
-        bot.send_message(
+    await db.save_user_notifications(call.message.chat.id, current_times)
+    user_notifications_cache[call.message.chat.id] = current_times
+    await show_notification_settings(call.message)
+
+async def _handle_save_callback(call, arg):
+    if arg == "notifications":
+        await bot.send_message(
             call.message.chat.id,
             "✅ Налаштування сповіщень збережено!"
         )
+
+CALLBACK_HANDLERS = {
+    "weather": _handle_weather_callback,
+    "forecast": _handle_forecast_callback,
+    "news": _handle_news_callback,
+    "toggle": _handle_toggle_callback,
+    "save": _handle_save_callback
+}
+
+# Callback handler
+@bot.callback_query_handler(func=lambda call: True)
+async def callback_handler(call):
+    prefix, _, arg = call.data.partition("_")
+    handler = CALLBACK_HANDLERS.get(prefix)
+    if handler is not None:
+        await handler(call, arg)
     
-    bot.answer_callback_query(call.id)
+    await bot.answer_callback_query(call.id)
+
+# Text message handlers by menu button text
+TEXT_HANDLERS = {
+    '🌤️ Погода': lambda message: show_settlement_selection(message, "weather"),
+    '🔮 Прогноз': lambda message: show_settlement_selection(message, "forecast"),
+    '📰 Новини': show_news_sources,
+    '📅 Свята сьогодні': send_today_holidays,
+    '⚙️ Налаштування': show_notification_settings
+}
 
 # Text message handler
 @bot.message_handler(content_types=['text'])
-def handle_text(message):
-    if message.text == '🌤️ Погода':
-        show_settlement_selection(message, "weather")
-    elif message.text == '🔮 Прогноз':
-        show_settlement_selection(message, "forecast")
-    elif message.text == '📰 Новини':
-        show_news_sources(message)
-    elif message.text == '📅 Свята сьогодні':
-        holiday_info = get_today_holidays()
-        bot.send_message(message.chat.id, holiday_info, parse_mode="Markdown")
-    elif message.text == '⚙️ Налаштування':
-        show_notification_settings(message)
+async def handle_text(message):
+    handler = TEXT_HANDLERS.get(message.text)
+    if handler is not None:
+        await handler(message)
     else:
-        bot.send_message(
+        await bot.send_message(
             message.chat.id,
             "Оберіть функцію за допомогою кнопок нижче або використайте команди:\n"
             "/weather - Погода\n"
@@ -344,33 +434,73 @@ def handle_text(message):
             "/settings - Налаштування"
         )
 
+# Send a weather notification to a single user, returns True when sent
+async def send_user_notification(user, weather_info, send_limit):
+    message_text = f"🔔 *Сповіщення про погоду у {user['settlement']}*\n\n{weather_info}"
+    
+    try:
+        async with send_limit:
+            await bot.send_message(user["user_id"], message_text, parse_mode="Markdown")
+        return True
+    except Exception as e:
+        logger.error(f"Error sending notification to user {user['user_id']}: {e}")
+        return False
+
 # Function to send notifications
-def send_weather_notifications():
-    while True:
-        current_time = datetime.datetime.now().strftime("%H:%M")
-        users = db.get_users_for_notification(current_time)
-        
-        for user in users:
-            if user["settlement"] in SETTLEMENTS:
-                lat = SETTLEMENTS[user["settlement"]]["lat"]
-                lon = SETTLEMENTS[user["settlement"]]["lon"]
-                weather_info = get_weather(lat, lon)
-                message_text = f"🔔 *Сповіщення про погоду у {user['settlement']}*\n\n{weather_info}"
-                
-                try:
-                    bot.send_message(user["user_id"], message_text, parse_mode="Markdown")
-                    db.update_last_notification(user["user_id"])
-                except Exception as e:
-                    logger.error(f"Error sending notification to user {user['user_id']}: {e}")
-        
-        # Wait 1 minute before next check
-        time.sleep(60)
+async def send_weather_notifications(notification_time):
+    users = await db.get_users_for_notification(notification_time)
+    
+    # Fetch weather once per settlement, not once per user
+    settlements = list({user["settlement"] for user in users if user["settlement"] in SETTLEMENTS})
+    weather = await asyncio.gather(*(
+        get_weather(SETTLEMENTS[settlement]["lat"], SETTLEMENTS[settlement]["lon"])
+        for settlement in settlements
+    ))
+    weather_by_settlement = dict(zip(settlements, weather))
+    
+    # Bound parallel sends to stay within Telegram's per-bot rate limit
+    send_limit = asyncio.Semaphore(NOTIFICATION_SEND_CONCURRENCY)
+    notified_users = [user for user in users if user["settlement"] in weather_by_settlement]
+    sent = await asyncio.gather(*(
+        send_user_notification(user, weather_by_settlement[user["settlement"]], send_limit)
+        for user in notified_users
+    ))
+    
+    # Record all successful notifications in one transaction
+    try:
+        await db.update_last_notifications_bulk(
+            [user["user_id"] for user, ok in zip(notified_users, sent) if ok]
+        )
+    except Exception as e:
+        logger.error(f"Error updating last notification time: {e}")
+
+# Schedule notifications at each configured time
+def create_notification_scheduler():
+    scheduler = AsyncIOScheduler()
+    for notification_time in DEFAULT_NOTIFICATION_TIMES:
+        hour, minute = map(int, notification_time.split(":"))
+        scheduler.add_job(
+            send_weather_notifications, 'cron',
+            hour=hour, minute=minute, args=[notification_time],
+            misfire_grace_time=60
+        )
+    return scheduler
+
+async def main():
+    global http_session
+    http_session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=WEATHER_API_TIMEOUT))
+    
+    # Start notification scheduler
+    scheduler = create_notification_scheduler()
+    scheduler.start()
+    
+    try:
+        print("Bot started!")
+        await bot.polling(non_stop=True)
+    finally:
+        scheduler.shutdown(wait=False)
+        await http_session.close()
 
 # Bot startup
 if __name__ == "__main__":
-    # Start notification thread
-    notification_thread = threading.Thread(target=send_weather_notifications, daemon=True)
-    notification_thread.start()
-    
-    print("Bot started!")
-    bot.polling(none_stop=True)
\ No newline at end of file
+    asyncio.run(main())
@@ -10,17 +10,21 @@ class NewsLinks:
                 "url": "https://chortkiv.city/"
             }
         }
+        
+        # Тексти повідомлень не змінюються, тому формуються один раз
+        self._rendered_sources = "*📰 Доступні новинні ресурси:*\n\n" + "".join(
+            f"*{source_info['name']}*\n[Перейти на сайт]({source_info['url']})\n\n"
+            for source_info in self.news_sources.values()
+        )
+        self._rendered_links = {
+            source_id: f"*📰 {source['name']}*\n[Перейти на сайт]({source['url']})"
+            for source_id, source in self.news_sources.items()
+        }
 
     def get_news_sources(self):
         """Отримати список доступних новинних ресурсів"""
-        formatted_sources = "*📰 Доступні новинні ресурси:*\n\n"
-        for source_id, source_info in self.news_sources.items():
-            formatted_sources += f"*{source_info['name']}*\n[Перейти на сайт]({source_info['url']})\n\n"
-        return formatted_sources
+        return self._rendered_sources
 
     def get_source_link(self, source_id):
         """Отримати посилання на конкретне джерело новин"""
-        if source_id in self.news_sources:
-            source = self.news_sources[source_id]
-            return f"*📰 {source['name']}*\n[Перейти на сайт]({source['url']})"
-        return "❌ Вказане джерело новин не підтримується" 
\ No newline at end of file
+        return self._rendered_links.get(source_id, "❌ Вказане джерело новин не підтримується") 
\ No newline at end of file